@@ -0,0 +1,85 @@
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from storage import ENGINES, open_engine
+
+# Write-heavy sync workload, as seen by a worker: clients push lists and items
+# (polling_list / polling_item / sync_*), with an occasional read in between.
+# Every engine runs the same pre-generated operation sequence.
+
+LISTS = 200
+ITEMS_PER_LIST = 20
+READ_RATIO = 0.05
+THREADS = 4
+
+
+def build_workload(seed=42):
+    rng = random.Random(seed)
+    lists = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(LISTS)]
+    ops = [("save_list", url, f"list {i}", f"creator {i % 10}", f"client{i % 10}") for i, url in enumerate(lists)]
+
+    for n in range(ITEMS_PER_LIST):
+        for url in lists:
+            ops.append(("save_item", url, f"item {n}", rng.randint(1, 10)))
+            if rng.random() < READ_RATIO:
+                ops.append(("view_items_in_list", rng.choice(lists)))
+    return ops
+
+
+def run_ops(engine, ops):
+    for op in ops:
+        getattr(engine, op[0])(*op[1:])
+
+
+def bench(kind, ops, threads):
+    workdir = tempfile.mkdtemp(prefix=f"bench_{kind}_")
+    try:
+        engine = open_engine(kind, os.path.join(workdir, "server"))
+        # Lists must exist before items are saved into them.
+        list_ops = [op for op in ops if op[0] == "save_list"]
+        other_ops = [op for op in ops if op[0] != "save_list"]
+
+        start = time.perf_counter()
+        run_ops(engine, list_ops)
+        chunks = [other_ops[i::threads] for i in range(threads)]
+        workers = [threading.Thread(target=run_ops, args=(engine, chunk)) for chunk in chunks]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        elapsed = time.perf_counter() - start
+
+        engine.close()
+
+        # Reopening measures recovery (log replay / schema check).
+        start = time.perf_counter()
+        reopened = open_engine(kind, os.path.join(workdir, "server"))
+        recovery = time.perf_counter() - start
+        items = sum(len(reopened.view_items_in_list(op[1])) for op in list_ops)
+        reopened.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return elapsed, recovery, items
+
+
+def main(engines):
+    ops = build_workload()
+    print(f"Workload: {len(ops)} operations ({LISTS} lists x {ITEMS_PER_LIST} items, {READ_RATIO:.0%} reads), {THREADS} threads")
+    for kind in engines:
+        elapsed, recovery, items = bench(kind, ops, THREADS)
+        print(f"{kind:>8}: {len(ops) / elapsed:10.0f} ops/s  ({elapsed:.2f}s, reopen {recovery * 1000:.1f}ms, {items} items recovered)")
+
+
+if __name__ == "__main__":
+    engines = sys.argv[1:] or list(ENGINES)
+    for kind in engines:
+        if kind not in ENGINES:
+            print(f"Usage: python benchmark.py [{'|'.join(ENGINES)} ...]")
+            sys.exit(1)
+    main(engines)
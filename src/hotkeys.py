@@ -0,0 +1,110 @@
+import hashlib
+import time
+
+class CountMinSketch:
+    # Fixed-size frequency sketch: estimates never undercount, and overcount
+    # only on hash collisions. Memory is width * depth counters, whatever the
+    # number of distinct keys.
+    def __init__(self, width=1024, depth=4):
+        self.width = width
+        self.depth = depth
+        self.table = [[0] * width for _ in range(depth)]
+
+    def _indexes(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8 * self.depth).digest()
+        for row in range(self.depth):
+            chunk = digest[row * 8:(row + 1) * 8]
+            yield row, int.from_bytes(chunk, "little") % self.width
+
+    def add(self, key, count=1):
+        estimate = None
+        for row, col in self._indexes(key):
+            self.table[row][col] += count
+            value = self.table[row][col]
+            if estimate is None or value < estimate:
+                estimate = value
+        return estimate
+
+    def estimate(self, key):
+        return min(self.table[row][col] for row, col in self._indexes(key))
+
+    def decay(self, times=1):
+        # Halve every counter `times` times so old traffic fades out.
+        if times >= 64:
+            self.table = [[0] * self.width for _ in range(self.depth)]
+            return
+        for row in self.table:
+            for col in range(self.width):
+                row[col] >>= times
+
+
+class HotKeyDetector:
+    # A key is hot while its decayed request count is at least `threshold`.
+    # Counts are halved every `window` seconds, so roughly threshold / window
+    # requests per second keep a key hot.
+    def __init__(self, threshold=100, window=5.0, width=1024, depth=4):
+        self.threshold = threshold
+        self.window = window
+        self.sketch = CountMinSketch(width, depth)
+        self.last_decay = time.monotonic()
+
+    def record(self, key):
+        now = time.monotonic()
+        windows = int((now - self.last_decay) // self.window)
+        if windows > 0:
+            # One pass however long the proxy was idle.
+            self.sketch.decay(windows)
+            self.last_decay += windows * self.window
+        return self.sketch.add(key) >= self.threshold
+
+
+class ResponseCache:
+    # Short-TTL cache of worker responses, grouped by worker so a write routed
+    # to a worker drops everything cached from it in one step.
+    def __init__(self, ttl=1.0, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # worker -> {request: (expires, response)}
+        self.entries = {}
+        self.size = 0
+        # worker -> generation, bumped on every write so in-flight reads that
+        # were sent before the write are not cached afterwards.
+        self.generations = {}
+
+    def generation(self, worker):
+        return self.generations.get(worker, 0)
+
+    def get(self, worker, request):
+        worker_entries = self.entries.get(worker)
+        if not worker_entries or request not in worker_entries:
+            return None
+        expires, response = worker_entries[request]
+        if expires < time.monotonic():
+            del worker_entries[request]
+            self.size -= 1
+            return None
+        return response
+
+    def put(self, worker, request, response, generation):
+        if generation != self.generation(worker):
+            return
+        if self.size >= self.max_entries:
+            self.purge()
+        worker_entries = self.entries.setdefault(worker, {})
+        if request not in worker_entries:
+            self.size += 1
+        worker_entries[request] = (time.monotonic() + self.ttl, response)
+
+    def invalidate(self, worker):
+        self.generations[worker] = self.generation(worker) + 1
+        self.size -= len(self.entries.pop(worker, {}))
+
+    def purge(self):
+        now = time.monotonic()
+        for worker_entries in self.entries.values():
+            for request in [request for request, (expires, _) in worker_entries.items() if expires < now]:
+                del worker_entries[request]
+        self.size = sum(len(worker_entries) for worker_entries in self.entries.values())
+        if self.size >= self.max_entries:
+            self.entries.clear()
+            self.size = 0
@@ -1,7 +1,20 @@
 import zmq
+import itertools
+import time
 from hashring import HashRing
+from hotkeys import HotKeyDetector, ResponseCache
 import json
 
+# Reads of hot keys are answered from the proxy cache for up to CACHE_TTL
+# seconds; writes always go to the owning worker and invalidate its entries.
+READ_ACTIONS = {"view_all_lists", "view_items"}
+HOT_THRESHOLD = 100
+HOT_WINDOW = 5.0
+CACHE_TTL = 1.0
+# Requests a worker has not answered within PENDING_TIMEOUT seconds (worker
+# down or restarting) are forgotten; a late reply is forwarded but not cached.
+PENDING_TIMEOUT = 30.0
+
 def main():
     context = zmq.Context()
 
@@ -15,6 +28,13 @@ def main():
 
     worker_addresses = [f"worker{i}".encode() for i in range(1, 6)]
     ring = HashRing(nodes=worker_addresses, replicas=10)
+    detector = HotKeyDetector(threshold=HOT_THRESHOLD, window=HOT_WINDOW)
+    cache = ResponseCache(ttl=CACHE_TTL)
+    # request id -> (sent at, worker, cache generation, request) for requests
+    # awaiting a reply; request is None when the reply must not be cached.
+    # Insertion order is send order, so the oldest entry is always first.
+    pending = {}
+    request_ids = itertools.count()
 
     print("Proxy is running...")
 
@@ -38,16 +58,49 @@ def main():
 
             key = client_id.decode()
             target_worker = ring.get_node(key)
-
-            backend.send_multipart([target_worker, client_id, request])
+            hot = detector.record(key)
+
+            try:
+                action = json.loads(request.decode()).get("action")
+            except (ValueError, AttributeError):
+                action = None
+
+            cacheable = None
+            if action in READ_ACTIONS:
+                if hot:
+                    cached = cache.get(target_worker, request)
+                    if cached is not None:
+                        frontend.send_multipart([client_id, cached])
+                        print(f"Proxy served hot key {key} from cache: {cached.decode()}")
+                        continue
+                    cacheable = request
+            else:
+                cache.invalidate(target_worker)
+
+            now = time.monotonic()
+            while pending:
+                oldest = next(iter(pending))
+                if now - pending[oldest][0] < PENDING_TIMEOUT:
+                    break
+                del pending[oldest]
+
+            request_id = str(next(request_ids)).encode()
+            pending[request_id] = (now, target_worker, cache.generation(target_worker), cacheable)
+            backend.send_multipart([target_worker, client_id, request_id, request])
             print(f"Proxy sent message to worker: {[target_worker, client_id, request]}")
 
     
         if backend in sockets:
             worker_msg = backend.recv_multipart()
-            worker_id, client_id, response = worker_msg
+            worker_id, client_id, request_id, response = worker_msg
             print(f"Proxy received message from worker: {response} to client {client_id.decode()}")
 
+            entry = pending.pop(request_id, None)
+            if entry is not None:
+                _, target_worker, generation, cacheable = entry
+                if target_worker == worker_id and cacheable is not None and json.loads(response.decode()).get("status") == "success":
+                    cache.put(worker_id, cacheable, response, generation)
+
             frontend.send_multipart([client_id, response])
             print(f"Proxy sent response to client {client_id.decode()}: {response.decode()}")
 
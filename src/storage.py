@@ -0,0 +1,493 @@
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+
+
+class StorageEngine(ABC):
+    # Interface every storage backend used by ShoppingListManager implements.
+    # Rows are returned as plain dicts so the manager, worker and client never
+    # depend on how a backend lays out its data.
+
+    @abstractmethod
+    def create_list(self, url, name, creator, client_id):
+        pass
+
+    @abstractmethod
+    def view_all_lists(self):
+        pass
+
+    @abstractmethod
+    def view_all_lists_local(self, client_id):
+        pass
+
+    @abstractmethod
+    def add_item(self, list_url, name, quantity, client_id):
+        pass
+
+    @abstractmethod
+    def view_items_in_list(self, list_url):
+        pass
+
+    @abstractmethod
+    def view_items_in_list_local(self, list_url, client_id):
+        pass
+
+    @abstractmethod
+    def delete_list(self, list_url, client_id):
+        pass
+
+    @abstractmethod
+    def save_list(self, url, name, creator, client_id):
+        pass
+
+    @abstractmethod
+    def save_item(self, list_url, name, quantity):
+        pass
+
+    @abstractmethod
+    def get_unsynced_lists(self):
+        pass
+
+    @abstractmethod
+    def get_unsynced_items(self):
+        pass
+
+    @abstractmethod
+    def list_is_sync(self, list_url):
+        pass
+
+    @abstractmethod
+    def item_is_sync(self, item_name, list_url):
+        pass
+
+    def close(self):
+        pass
+
+
+class SQLiteEngine(StorageEngine):
+    def __init__(self, db_path):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.initialize_database()
+
+    def initialize_database(self):
+        #Initialize the database with the required tables.
+        with self.lock:
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS lists (
+                    url TEXT NOT NULL PRIMARY KEY,
+                    name TEXT,
+                    creator TEXT,
+                    client_id TEXT NOT NULL,
+                    active BOOLEAN DEFAULT TRUE,
+                    sync_status TEXT DEFAULT 'unsynced'
+                )
+            """)
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS items (
+                    name TEXT NOT NULL,
+                    list_url TEXT NOT NULL,
+                    quantity INTEGER NOT NULL,
+                    bought BOOLEAN DEFAULT FALSE,
+                    deleted BOOLEAN DEFAULT FALSE,
+                    sync_status TEXT DEFAULT 'unsynced',
+                    PRIMARY KEY (name, list_url),
+                    FOREIGN KEY (list_url) REFERENCES list (url)
+                )
+            """)
+            self.db.commit()
+
+    def create_list(self, url, name, creator, client_id):
+        with self.lock:
+            self.db.execute("INSERT INTO lists (url, name, creator, client_id) VALUES (?, ?, ?, ?)", (url, name, creator, client_id))
+            self.db.commit()
+
+    def view_all_lists(self):
+        with self.lock:
+            cursor = self.db.execute("SELECT url, name, creator FROM lists WHERE active = 1")
+            lists = cursor.fetchall()
+
+        return [{"url": lst[0], "name": lst[1], "creator": lst[2]} for lst in lists]
+
+    def view_all_lists_local(self, client_id):
+        with self.lock:
+            cursor = self.db.execute("SELECT url, name, creator FROM lists WHERE client_id = ? AND active = 1", (client_id,))
+            lists = cursor.fetchall()
+
+        return [{"url": lst[0], "name": lst[1], "creator": lst[2]} for lst in lists]
+
+    def add_item(self, list_url, name, quantity, client_id):
+        with self.lock:
+            cursor = self.db.execute("SELECT COUNT(*) FROM lists WHERE url = ? AND client_id = ?", (list_url,client_id,))
+            if cursor.fetchone()[0] == 0:
+                raise ValueError(f"No list found with URL: {list_url}")
+
+            self.db.execute("""
+                INSERT INTO items (name, list_url, quantity)
+                VALUES (?, ?, ?)
+            """, (name, list_url, quantity))
+            self.db.commit()
+
+    def view_items_in_list(self, list_url):
+        with self.lock:
+            cursor = self.db.execute("""
+                SELECT i.name, i.quantity, i.bought
+                FROM items AS i
+                JOIN lists AS l ON i.list_url = l.url
+                WHERE i.list_url = ? AND i.deleted = 0
+            """, (list_url,))
+            items = cursor.fetchall()
+
+        return [{"name": item[0], "quantity": item[1], "bought": item[2]} for item in items]
+
+    def view_items_in_list_local(self, list_url, client_id):
+        with self.lock:
+            cursor = self.db.execute("""
+                SELECT i.name, i.quantity, i.bought
+                FROM items AS i
+                JOIN lists AS l ON i.list_url = l.url
+                WHERE i.list_url = ? AND l.client_id = ? AND i.deleted = 0
+            """, (list_url, client_id))
+            items = cursor.fetchall()
+
+        return [{"name": item[0], "quantity": item[1], "bought": item[2]} for item in items]
+
+    def delete_list(self, list_url, client_id):
+        with self.lock:
+            cursor = self.db.execute("SELECT COUNT(*) FROM lists WHERE url = ? AND client_id = ?", (list_url,client_id,))
+            if cursor.fetchone()[0] == 0:
+                raise ValueError(f"No list found with URL: {list_url}")
+
+            self.db.execute("UPDATE lists SET active = 0 WHERE url = ?", (list_url,))
+
+            self.db.execute("UPDATE items SET deleted = 1 WHERE list_url = ?", (list_url,))
+            self.db.commit()
+
+    def save_list(self, url, name, creator, client_id):
+        with self.lock:
+            cursor = self.db.execute("SELECT COUNT(*) FROM lists WHERE url = ?", (url,))
+            if cursor.fetchone()[0] > 0:
+                raise ValueError(f"List with URL '{url}' already exists in the server database.")
+
+            self.db.execute("""
+                INSERT INTO lists (url, name, creator, client_id, active)
+                VALUES (?, ?, ?, ?, 1)
+            """, (url, name, creator, client_id))
+            self.db.commit()
+
+    def save_item(self, list_url, name, quantity):
+        with self.lock:
+            cursor = self.db.execute("SELECT COUNT(*) FROM lists WHERE url = ?", (list_url,))
+            if cursor.fetchone()[0] == 0:
+                raise ValueError(f"No list found with URL '{list_url}'.")
+
+            self.db.execute("""
+                INSERT INTO items (name, list_url, quantity)
+                VALUES (?, ?, ?)
+            """, (name, list_url, quantity))
+            self.db.commit()
+
+    def get_unsynced_lists(self):
+        with self.lock:
+            cursor = self.db.execute(
+                "SELECT url, name, creator FROM lists WHERE sync_status = 'unsynced'"
+                )
+            rows = cursor.fetchall()
+        return [{"url": row[0], "name": row[1], "creator": row[2]} for row in rows]
+
+    def get_unsynced_items(self):
+        with self.lock:
+            cursor = self.db.execute(
+                "SELECT name, list_url, quantity FROM items WHERE sync_status = 'unsynced'"
+                )
+            rows = cursor.fetchall()
+        return [{"name": row[0], "list_url": row[1], "quantity": row[2]} for row in rows]
+
+    def list_is_sync(self, list_url):
+        with self.lock:
+            self.db.execute(
+                "UPDATE lists SET sync_status = 'synced' WHERE url = ?", (list_url,)
+                )
+            self.db.commit()
+
+    def item_is_sync(self, item_name, list_url):
+        with self.lock:
+            self.db.execute(
+                "UPDATE items SET sync_status = 'synced' WHERE name = ? AND list_url = ?", (item_name, list_url)
+                )
+            self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+class LogEngine(StorageEngine):
+    # Append-only log engine. Every write is appended as one JSON record to
+    # <path> and applied to an in-memory index, so reads never touch disk.
+    # Every `checkpoint_every` records the index is written to
+    # <path>.checkpoint and the log is truncated. On startup the checkpoint is
+    # loaded and the log is replayed on top of it (records whose seq is already
+    # covered by the checkpoint are skipped, a torn last record is dropped).
+    def __init__(self, log_path, checkpoint_every=1000, fsync=True):
+        self.lock = threading.Lock()
+        self.log_path = log_path
+        self.checkpoint_path = f"{log_path}.checkpoint"
+        self.checkpoint_every = checkpoint_every
+        self.fsync = fsync
+
+        self.lists = {}
+        self.items = {}
+        # list_url -> {item_name: None}, keeps items in insertion order per list
+        self.items_by_list = {}
+        self.seq = 0
+        self.records_since_checkpoint = 0
+        # Set when a failed append could not be rolled back; the log may end in
+        # a partial record, so no further writes are accepted.
+        self.write_error = None
+
+        self.recover()
+        # Unbuffered, so a failed write never leaves bytes queued for a later flush.
+        self.log = open(self.log_path, "ab", buffering=0)
+
+    def recover(self):
+        #Rebuild the in-memory index from the last checkpoint plus the log.
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self.seq = snapshot["seq"]
+            for lst in snapshot["lists"]:
+                self.apply({"op": "put_list", "list": lst})
+            for item in snapshot["items"]:
+                self.apply({"op": "put_item", "item": item})
+
+        if not os.path.exists(self.log_path):
+            return
+
+        valid_bytes = 0
+        with open(self.log_path, "rb") as f:
+            for line in f:
+                # Partially written record from a crash, everything after it is garbage.
+                # A record without its newline is torn even if it parses, otherwise
+                # the next append would be written onto the same line.
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                valid_bytes += len(line)
+                if record["seq"] <= self.seq:
+                    continue
+                self.apply(record)
+                self.seq = record["seq"]
+                self.records_since_checkpoint += 1
+
+        if valid_bytes < os.path.getsize(self.log_path):
+            with open(self.log_path, "r+b") as f:
+                f.truncate(valid_bytes)
+
+    def apply(self, record):
+        op = record["op"]
+        if op == "put_list":
+            lst = dict(record["list"])
+            self.lists[lst["url"]] = lst
+            self.items_by_list.setdefault(lst["url"], {})
+        elif op == "put_item":
+            item = dict(record["item"])
+            self.items[(item["name"], item["list_url"])] = item
+            self.items_by_list.setdefault(item["list_url"], {})[item["name"]] = None
+        elif op == "delete_list":
+            self.lists[record["url"]]["active"] = 0
+            for name in self.items_by_list.get(record["url"], {}):
+                self.items[(name, record["url"])]["deleted"] = 1
+        elif op == "list_synced":
+            lst = self.lists.get(record["url"])
+            if lst:
+                lst["sync_status"] = "synced"
+        elif op == "item_synced":
+            item = self.items.get((record["name"], record["list_url"]))
+            if item:
+                item["sync_status"] = "synced"
+        else:
+            raise ValueError(f"Unknown log record operation '{op}'.")
+
+    def append(self, record):
+        # Caller must hold self.lock. The record is durable before seq and the
+        # index change; a failed write is cut off so the log ends on a full record.
+        if self.write_error is not None:
+            raise OSError(f"Log '{self.log_path}' is read-only after a failed write: {self.write_error}")
+
+        record["seq"] = self.seq + 1
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        offset = os.fstat(self.log.fileno()).st_size
+        try:
+            written = self.log.write(line)
+            if written != len(line):
+                raise OSError(f"Short write to '{self.log_path}': {written} of {len(line)} bytes.")
+            if self.fsync:
+                os.fsync(self.log.fileno())
+        except OSError as e:
+            try:
+                os.ftruncate(self.log.fileno(), offset)
+            except OSError:
+                self.write_error = e
+            raise
+
+        self.seq += 1
+        self.apply(record)
+
+        self.records_since_checkpoint += 1
+        if self.records_since_checkpoint >= self.checkpoint_every:
+            self.checkpoint_locked()
+
+    def checkpoint(self):
+        with self.lock:
+            self.checkpoint_locked()
+
+    def checkpoint_locked(self):
+        snapshot = {
+            "seq": self.seq,
+            "lists": list(self.lists.values()),
+            "items": list(self.items.values()),
+        }
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+        # The rename must be on disk before the truncate, or a power loss could
+        # keep the empty log next to the previous checkpoint.
+        dir_fd = os.open(os.path.dirname(os.path.abspath(self.checkpoint_path)), os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+        # A crash before this truncate is harmless: replay skips seq <= snapshot seq.
+        self.log.truncate(0)
+        if self.fsync:
+            os.fsync(self.log.fileno())
+        self.records_since_checkpoint = 0
+
+    def client_key(self, client_id):
+        # Workers pass the raw ZMQ identity frame (bytes), clients a str; the
+        # log stores JSON, so keep it as text.
+        if isinstance(client_id, bytes):
+            return client_id.decode()
+        return client_id
+
+    def new_list(self, url, name, creator, client_id):
+        return {"url": url, "name": name, "creator": creator, "client_id": self.client_key(client_id), "active": 1, "sync_status": "unsynced"}
+
+    def new_item(self, list_url, name, quantity):
+        return {"name": name, "list_url": list_url, "quantity": quantity, "bought": 0, "deleted": 0, "sync_status": "unsynced"}
+
+    def owns_list(self, list_url, client_id):
+        lst = self.lists.get(list_url)
+        return lst is not None and lst["client_id"] == self.client_key(client_id)
+
+    def items_of(self, list_url):
+        result = []
+        for name in self.items_by_list.get(list_url, {}):
+            item = self.items[(name, list_url)]
+            if not item["deleted"]:
+                result.append({"name": item["name"], "quantity": item["quantity"], "bought": item["bought"]})
+        return result
+
+    def create_list(self, url, name, creator, client_id):
+        with self.lock:
+            if url in self.lists:
+                raise ValueError(f"List with URL '{url}' already exists.")
+            self.append({"op": "put_list", "list": self.new_list(url, name, creator, client_id)})
+
+    def view_all_lists(self):
+        with self.lock:
+            return [{"url": lst["url"], "name": lst["name"], "creator": lst["creator"]}
+                    for lst in self.lists.values() if lst["active"]]
+
+    def view_all_lists_local(self, client_id):
+        with self.lock:
+            return [{"url": lst["url"], "name": lst["name"], "creator": lst["creator"]}
+                    for lst in self.lists.values() if lst["active"] and lst["client_id"] == self.client_key(client_id)]
+
+    def add_item(self, list_url, name, quantity, client_id):
+        with self.lock:
+            if not self.owns_list(list_url, client_id):
+                raise ValueError(f"No list found with URL: {list_url}")
+            if (name, list_url) in self.items:
+                raise ValueError(f"Item '{name}' already exists in list '{list_url}'.")
+            self.append({"op": "put_item", "item": self.new_item(list_url, name, quantity)})
+
+    def view_items_in_list(self, list_url):
+        with self.lock:
+            if list_url not in self.lists:
+                return []
+            return self.items_of(list_url)
+
+    def view_items_in_list_local(self, list_url, client_id):
+        with self.lock:
+            if not self.owns_list(list_url, client_id):
+                return []
+            return self.items_of(list_url)
+
+    def delete_list(self, list_url, client_id):
+        with self.lock:
+            if not self.owns_list(list_url, client_id):
+                raise ValueError(f"No list found with URL: {list_url}")
+            self.append({"op": "delete_list", "url": list_url})
+
+    def save_list(self, url, name, creator, client_id):
+        with self.lock:
+            if url in self.lists:
+                raise ValueError(f"List with URL '{url}' already exists in the server database.")
+            self.append({"op": "put_list", "list": self.new_list(url, name, creator, client_id)})
+
+    def save_item(self, list_url, name, quantity):
+        with self.lock:
+            if list_url not in self.lists:
+                raise ValueError(f"No list found with URL '{list_url}'.")
+            if (name, list_url) in self.items:
+                raise ValueError(f"Item '{name}' already exists in list '{list_url}'.")
+            self.append({"op": "put_item", "item": self.new_item(list_url, name, quantity)})
+
+    def get_unsynced_lists(self):
+        with self.lock:
+            return [{"url": lst["url"], "name": lst["name"], "creator": lst["creator"]}
+                    for lst in self.lists.values() if lst["sync_status"] == "unsynced"]
+
+    def get_unsynced_items(self):
+        with self.lock:
+            return [{"name": item["name"], "list_url": item["list_url"], "quantity": item["quantity"]}
+                    for item in self.items.values() if item["sync_status"] == "unsynced"]
+
+    def list_is_sync(self, list_url):
+        with self.lock:
+            lst = self.lists.get(list_url)
+            if lst and lst["sync_status"] != "synced":
+                self.append({"op": "list_synced", "url": list_url})
+
+    def item_is_sync(self, item_name, list_url):
+        with self.lock:
+            item = self.items.get((item_name, list_url))
+            if item and item["sync_status"] != "synced":
+                self.append({"op": "item_synced", "name": item_name, "list_url": list_url})
+
+    def close(self):
+        with self.lock:
+            self.log.close()
+
+
+ENGINES = {
+    "sqlite": SQLiteEngine,
+    "log": LogEngine,
+}
+
+
+def open_engine(kind, path):
+    if kind not in ENGINES:
+        raise ValueError(f"Unknown storage engine '{kind}'. Choose one of: {', '.join(ENGINES)}.")
+    return ENGINES[kind](path)
@@ -2,7 +2,7 @@ import zmq
 import json
 from manager import ShoppingListManager
 
-def main(worker_id):
+def main(worker_id, engine="sqlite"):
     context = zmq.Context()
 
     # Connect worker to the proxy
@@ -11,31 +11,33 @@ def main(worker_id):
     worker.connect("tcp://localhost:5556")
 
     
-    db_path = f"server_{worker_id}.db"
-    print(f"Worker {worker_id} is using database: {db_path}")
-    manager = ShoppingListManager(db_path)
+    db_path = f"server_{worker_id}.db" if engine == "sqlite" else f"server_{worker_id}.{engine}"
+    print(f"Worker {worker_id} is using {engine} storage: {db_path}")
+    manager = ShoppingListManager(db_path, engine=engine)
 
     print(f"Worker {worker_id} is ready and waiting for tasks...")
 
     while True:
         message = worker.recv_multipart()
 
+        # request_id is opaque to the worker, it is echoed back so the proxy can
+        # match the reply to the request it forwarded.
         try:
-            if len(message) != 2:
-                raise ValueError(f"Expected 2 parts in message, got {len(message)}")
+            if len(message) != 3:
+                raise ValueError(f"Expected 3 parts in message, got {len(message)}")
 
-            client_id, request_raw = message
+            client_id, request_id, request_raw = message
             request = json.loads(request_raw.decode())  
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object.")
             print(f"Worker {worker_id} received request: {request}")
 
         except ValueError as e:
             print(f"Worker {worker_id} failed to decode message: {e}")
-            if len(message) > 1:
-                client_id = message[1]
-            else:
-                client_id = b"unknown_client"
+            client_id = message[0] if message else b"unknown_client"
+            request_id = message[1] if len(message) > 2 else b""
             response = {"status": "error", "message": str(e)}
-            worker.send_multipart([client_id, json.dumps(response).encode()])
+            worker.send_multipart([client_id, request_id, json.dumps(response).encode()])
             continue
 
         action = request.get("action")
@@ -109,13 +111,14 @@ def main(worker_id):
         else:
             response = {"status": "error", "message": "Unknown action."}
 
-        worker.send_multipart([client_id, json.dumps(response).encode()])
+        worker.send_multipart([client_id, request_id, json.dumps(response).encode()])
         print(f"Worker {worker_id} sent response: {response} to client {client_id}")
 
 
 if __name__ == "__main__":
     import sys
     if len(sys.argv) < 2:
-        print("Usage: python worker.py <worker_id>")
+        print("Usage: python worker.py <worker_id> [sqlite|log]")
         sys.exit(1)
-    main(worker_id=sys.argv[1])
+    engine = sys.argv[2] if len(sys.argv) > 2 else "sqlite"
+    main(worker_id=sys.argv[1], engine=engine)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The modules in src/ import each other by bare name, as when run from src/.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
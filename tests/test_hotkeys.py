@@ -0,0 +1,123 @@
+import hotkeys
+from hotkeys import CountMinSketch, HotKeyDetector, ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def use_clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(hotkeys.time, "monotonic", clock)
+    return clock
+
+
+def test_sketch_counts_and_never_undercounts():
+    sketch = CountMinSketch(width=16, depth=3)
+    for i in range(200):
+        sketch.add(f"key{i % 40}")
+    assert all(sketch.estimate(f"key{i}") >= 5 for i in range(40))
+
+    exact = CountMinSketch()
+    assert exact.add("a", 7) == 7
+    assert exact.estimate("a") == 7
+    assert exact.estimate("b") == 0
+
+
+def test_sketch_decay_halves_and_clears():
+    sketch = CountMinSketch()
+    sketch.add("a", 40)
+    sketch.decay()
+    assert sketch.estimate("a") == 20
+    sketch.decay(2)
+    assert sketch.estimate("a") == 5
+    sketch.add("a", 1000)
+    sketch.decay(100)
+    assert sketch.estimate("a") == 0
+
+
+def test_detector_marks_key_hot_at_threshold(monkeypatch):
+    use_clock(monkeypatch)
+    detector = HotKeyDetector(threshold=3, window=5.0)
+    assert [detector.record("a") for _ in range(4)] == [False, False, True, True]
+    assert detector.record("b") is False
+
+
+def test_detector_decays_per_elapsed_window(monkeypatch):
+    clock = use_clock(monkeypatch)
+    detector = HotKeyDetector(threshold=8, window=5.0)
+    for _ in range(16):
+        detector.record("a")
+
+    clock.now += 5.0
+    assert detector.record("b") is False
+    assert detector.sketch.estimate("a") == 8
+
+    clock.now += 12.0
+    detector.record("b")
+    assert detector.sketch.estimate("a") == 2
+    # The leftover 2s still count towards the next window.
+    assert detector.last_decay == 1015.0
+
+    clock.now += 86400.0
+    detector.record("b")
+    assert detector.sketch.estimate("a") == 0
+    assert detector.record("a") is False
+
+
+def test_cache_serves_until_ttl_expires(monkeypatch):
+    clock = use_clock(monkeypatch)
+    cache = ResponseCache(ttl=1.0)
+    cache.put(b"worker1", b"req", b"resp", cache.generation(b"worker1"))
+    assert cache.get(b"worker1", b"req") == b"resp"
+    assert cache.get(b"worker2", b"req") is None
+
+    clock.now += 1.5
+    assert cache.get(b"worker1", b"req") is None
+    assert cache.size == 0
+
+
+def test_cache_invalidate_drops_only_that_worker(monkeypatch):
+    use_clock(monkeypatch)
+    cache = ResponseCache()
+    cache.put(b"worker1", b"a", b"1", 0)
+    cache.put(b"worker1", b"b", b"2", 0)
+    cache.put(b"worker2", b"a", b"3", 0)
+
+    cache.invalidate(b"worker1")
+    assert cache.get(b"worker1", b"a") is None
+    assert cache.get(b"worker1", b"b") is None
+    assert cache.get(b"worker2", b"a") == b"3"
+    assert cache.size == 1
+
+
+def test_cache_rejects_reads_sent_before_a_write(monkeypatch):
+    use_clock(monkeypatch)
+    cache = ResponseCache()
+    generation = cache.generation(b"worker1")
+    cache.invalidate(b"worker1")
+
+    cache.put(b"worker1", b"req", b"stale", generation)
+    assert cache.get(b"worker1", b"req") is None
+
+    cache.put(b"worker1", b"req", b"fresh", cache.generation(b"worker1"))
+    assert cache.get(b"worker1", b"req") == b"fresh"
+
+
+def test_cache_purges_expired_entries_when_full(monkeypatch):
+    clock = use_clock(monkeypatch)
+    cache = ResponseCache(ttl=1.0, max_entries=2)
+    cache.put(b"worker1", b"a", b"1", 0)
+    clock.now += 0.5
+    cache.put(b"worker2", b"b", b"2", 0)
+    clock.now += 0.75
+
+    cache.put(b"worker1", b"c", b"3", 0)
+    assert cache.size == 2
+    assert cache.get(b"worker1", b"a") is None
+    assert cache.get(b"worker2", b"b") == b"2"
+    assert cache.get(b"worker1", b"c") == b"3"
@@ -0,0 +1,230 @@
+import json
+import os
+import pytest
+from manager import ShoppingListManager
+from storage import LogEngine, SQLiteEngine, StorageEngine
+
+
+def open_log(tmp_path, **kwargs):
+    return LogEngine(str(tmp_path / "server.log"), **kwargs)
+
+
+def item_names(engine, list_url):
+    return [item["name"] for item in engine.view_items_in_list(list_url)]
+
+
+def test_replay_restores_state_without_checkpoint(tmp_path):
+    engine = open_log(tmp_path)
+    engine.save_list("u1", "groceries", "ana", "c1")
+    engine.save_item("u1", "a", 1)
+    engine.save_item("u1", "b", 2)
+    engine.list_is_sync("u1")
+    engine.close()
+
+    engine = open_log(tmp_path)
+    assert item_names(engine, "u1") == ["a", "b"]
+    assert engine.get_unsynced_lists() == []
+    assert not os.path.exists(engine.checkpoint_path)
+    engine.close()
+
+
+def test_checkpoint_truncates_log_and_replays_tail(tmp_path):
+    engine = open_log(tmp_path, checkpoint_every=3)
+    engine.save_list("u1", "groceries", "ana", "c1")
+    engine.save_item("u1", "a", 1)
+    engine.save_item("u1", "b", 1)
+    # The third record triggered a checkpoint, so only later records are in the log.
+    assert os.path.getsize(engine.log_path) == 0
+    engine.save_item("u1", "c", 1)
+    engine.delete_list("u1", "c1")
+    engine.close()
+
+    engine = open_log(tmp_path, checkpoint_every=3)
+    assert engine.seq == 5
+    assert engine.view_all_lists() == []
+    assert item_names(engine, "u1") == []
+    assert len(engine.get_unsynced_items()) == 3
+    engine.close()
+
+
+def test_replay_skips_records_covered_by_checkpoint(tmp_path):
+    engine = open_log(tmp_path)
+    engine.save_list("u1", "groceries", "ana", "c1")
+    engine.save_item("u1", "a", 1)
+    with open(engine.log_path, "rb") as f:
+        log_before_checkpoint = f.read()
+    engine.checkpoint()
+    engine.close()
+
+    # Crash between writing the checkpoint and truncating the log.
+    with open(engine.log_path, "wb") as f:
+        f.write(log_before_checkpoint)
+
+    engine = open_log(tmp_path)
+    assert item_names(engine, "u1") == ["a"]
+    engine.save_item("u1", "b", 1)
+    assert engine.seq == 3
+    engine.close()
+
+
+@pytest.mark.parametrize("torn_tail", [b'{"seq": 9, "op": "put_it', None])
+def test_torn_tail_is_dropped_and_later_writes_survive(tmp_path, torn_tail):
+    engine = open_log(tmp_path)
+    engine.save_list("u1", "groceries", "ana", "c1")
+    engine.save_item("u1", "a", 1)
+    engine.save_item("u1", "b", 1)
+    engine.close()
+
+    with open(engine.log_path, "rb") as f:
+        data = f.read()
+    if torn_tail is None:
+        # Last record fully written except for its newline: still torn.
+        data = data[:-1]
+    else:
+        data += torn_tail
+    with open(engine.log_path, "wb") as f:
+        f.write(data)
+
+    engine = open_log(tmp_path)
+    expected = ["a"] if torn_tail is None else ["a", "b"]
+    assert item_names(engine, "u1") == expected
+    engine.save_item("u1", "c", 1)
+    engine.save_item("u1", "d", 1)
+    engine.close()
+
+    engine = open_log(tmp_path)
+    assert item_names(engine, "u1") == expected + ["c", "d"]
+    with open(engine.log_path, "rb") as f:
+        lines = f.read().split(b"\n")
+    assert lines[-1] == b""
+    assert all(json.loads(line) for line in lines[:-1])
+    engine.close()
+
+
+def test_incomplete_engine_fails_at_construction():
+    class PartialEngine(StorageEngine):
+        def view_all_lists(self):
+            return []
+
+    with pytest.raises(TypeError):
+        PartialEngine()
+
+
+@pytest.mark.parametrize("engine_class", [SQLiteEngine, LogEngine])
+def test_engines_implement_the_interface(tmp_path, engine_class):
+    engine = engine_class(str(tmp_path / "server"))
+    assert isinstance(engine, StorageEngine)
+    engine.close()
+
+
+@pytest.mark.parametrize("engine", ["sqlite", "log"])
+def test_worker_sync_path(tmp_path, engine):
+    # Same calls worker.py makes: polling_list passes the raw identity frame
+    # (bytes) as client_id, sync_list the str from the request body.
+    manager = ShoppingListManager(str(tmp_path / "server"), engine=engine)
+    manager.save_list("u1", "groceries", "ana", b"3f2a")
+    manager.save_list("u2", "party", "rui", "client2")
+    manager.save_item("u1", "milk", 2)
+    manager.save_item("u2", "cake", 1)
+    with pytest.raises(ValueError):
+        manager.save_list("u1", "groceries", "ana", b"3f2a")
+    with pytest.raises(ValueError):
+        manager.save_item("missing", "milk", 1)
+
+    assert manager.view_all_lists() == [
+        {"url": "u1", "name": "groceries", "creator": "ana"},
+        {"url": "u2", "name": "party", "creator": "rui"},
+    ]
+    assert manager.view_items_in_list("u1") == [{"name": "milk", "quantity": 2, "bought": 0}]
+    manager.close()
+
+    manager = ShoppingListManager(str(tmp_path / "server"), engine=engine)
+    assert manager.view_items_in_list("u2") == [{"name": "cake", "quantity": 1, "bought": 0}]
+    assert len(manager.get_unsynced_lists()) == 2
+    manager.close()
+
+
+class FailingLog:
+    # Wraps the engine's log file and writes only part of the next record.
+    def __init__(self, log, fail_times=1):
+        self.log = log
+        self.fail_times = fail_times
+
+    def write(self, data):
+        if self.fail_times:
+            self.fail_times -= 1
+            self.log.write(data[:len(data) // 2])
+            raise OSError(28, "No space left on device")
+        return self.log.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.log, name)
+
+
+def test_failed_append_is_rolled_back(tmp_path):
+    engine = open_log(tmp_path)
+    engine.save_list("u1", "groceries", "ana", "c1")
+    engine.save_item("u1", "a", 1)
+    engine.log = FailingLog(engine.log)
+
+    with pytest.raises(OSError):
+        engine.save_item("u1", "b", 1)
+    assert engine.seq == 2
+    assert item_names(engine, "u1") == ["a"]
+
+    engine.save_item("u1", "c", 1)
+    assert engine.seq == 3
+    engine.close()
+
+    engine = open_log(tmp_path)
+    assert item_names(engine, "u1") == ["a", "c"]
+    assert engine.seq == 3
+    engine.close()
+
+
+def test_unrecoverable_append_failure_blocks_writes(tmp_path, monkeypatch):
+    engine = open_log(tmp_path)
+    engine.save_list("u1", "groceries", "ana", "c1")
+    engine.log = FailingLog(engine.log)
+
+    def ftruncate(fd, length):
+        raise OSError(5, "Input/output error")
+
+    monkeypatch.setattr("storage.os.ftruncate", ftruncate)
+    with pytest.raises(OSError):
+        engine.save_item("u1", "a", 1)
+    with pytest.raises(OSError, match="read-only"):
+        engine.save_item("u1", "b", 1)
+    assert engine.seq == 1
+    assert item_names(engine, "u1") == []
+    engine.close()
+
+
+def test_checkpoint_syncs_directory_before_truncating_log(tmp_path, monkeypatch):
+    engine = open_log(tmp_path)
+    engine.save_list("u1", "groceries", "ana", "c1")
+    events = []
+    dir_fds = set()
+    real_open, real_fsync, real_truncate = os.open, os.fsync, engine.log.truncate
+
+    def fake_open(path, flags, *args):
+        fd = real_open(path, flags, *args)
+        if os.path.isdir(path):
+            dir_fds.add(fd)
+        return fd
+
+    def fake_fsync(fd):
+        if fd in dir_fds:
+            events.append("dir fsync")
+        real_fsync(fd)
+
+    def fake_truncate(size):
+        events.append("log truncate")
+        return real_truncate(size)
+
+    monkeypatch.setattr("storage.os.open", fake_open)
+    monkeypatch.setattr("storage.os.fsync", fake_fsync)
+    monkeypatch.setattr(engine.log, "truncate", fake_truncate, raising=False)
+    engine.checkpoint()
+    assert events == ["dir fsync", "log truncate"]
+    engine.close()